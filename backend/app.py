@@ -3,185 +3,645 @@ Flood Alert System - Flask REST API
 Author: Your Team Name
 Date: December 2025
 
-Run with: python app.py
+Development: python app.py
+Production:  gunicorn -c gunicorn.conf.py wsgi:app
 API will be available at: http://localhost:5000
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, abort, make_response, request, stream_with_context
 from flask_cors import CORS
+from flask_caching import Cache
+from flask_compress import Compress
+import brotli
+import itertools
+import orjson
 import psycopg2
-from psycopg2.extras import RealDictCursor
-import json
+from psycopg2 import pool
+from psycopg2.extras import RealDictCursor, execute_values
+import os
+import shutil
+import sys
+import threading
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from functools import wraps
+from decimal import Decimal
 from config import Config
+from api_docs import API_DOCS
 
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app, resources={r"/api/*": {"origins": Config.CORS_ORIGINS}})
+cache = Cache(app, config=Config.CACHE_CONFIG)
+app.config.update(
+    COMPRESS_MIMETYPES=['application/json', 'application/x-protobuf'],
+    COMPRESS_ALGORITHM=['br', 'gzip'],
+    COMPRESS_LEVEL=Config.COMPRESS_LEVEL,
+    COMPRESS_BR_LEVEL=Config.COMPRESS_LEVEL,
+    # Flask-Compress would buffer a whole streamed body to compress it;
+    # stream_geojson compresses its output incrementally instead
+    COMPRESS_STREAMS=False
+)
 
-# Database connection helper
+# Runs the /api/statistics queries side by side (greenlets under gunicorn/gevent)
+STATISTICS_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+# calculate-risk lookups in progress, keyed by rounded coordinates, so that
+# concurrent requests for the same point share one database call
+RISK_INFLIGHT = {}
+RISK_INFLIGHT_LOCK = threading.Lock()
+
+# Health checks served so far; every HEALTH_QUERY_INTERVAL-th one queries the database
+HEALTH_CHECKS = itertools.count()
+
+# Database connection helpers
 def get_db_connection():
-    """Create and return database connection"""
+    """Borrow a connection from the shared pool"""
     try:
-        conn = psycopg2.connect(**Config.DB_CONFIG)
-        return conn
-    except psycopg2.Error as e:
+        return Config.get_pool(on_connect=prepare_statements).getconn()
+    except (psycopg2.Error, pool.PoolError) as e:
         print(f"Database connection error: {e}")
         return None
 
-def execute_query(query, params=None, fetch_one=False):
-    """Execute query and return results"""
+@contextmanager
+def db_cursor(cursor_factory=RealDictCursor, name=None):
+    """Yield a cursor on a pooled connection, committing on success and
+    rolling back on error before the connection is returned to the pool.
+    Pass `name` to get a server-side cursor that fetches rows in batches."""
     conn = get_db_connection()
     if not conn:
-        return None
+        raise psycopg2.OperationalError('Database connection failed')
     
     try:
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        cur.execute(query, params)
-        
-        if fetch_one:
-            result = cur.fetchone()
-        else:
-            result = cur.fetchall()
-        
+        cur = conn.cursor(name=name, cursor_factory=cursor_factory)
+        yield cur
         cur.close()
-        conn.close()
-        return result
+        conn.commit()
+    except BaseException:
+        # BaseException so an abandoned stream (GeneratorExit) also rolls back
+        if not conn.closed:
+            conn.rollback()
+        raise
+    finally:
+        Config.get_pool().putconn(conn, close=bool(conn.closed))
+
+def execute_query(query, params=None, fetch_one=False):
+    """Execute query and return results"""
+    try:
+        with db_cursor() as cur:
+            cur.execute(query, params)
+            
+            if fetch_one:
+                return cur.fetchone()
+            return cur.fetchall()
     except Exception as e:
         print(f"Query error: {e}")
-        if conn:
-            conn.close()
         return None
 
-def geojson_from_query(query, params=None):
-    """Execute query and return GeoJSON FeatureCollection"""
-    rows = execute_query(query, params)
+def feature_collection_sql(query):
+    """Wrap query so PostGIS returns its rows as a single GeoJSON
+    FeatureCollection text column named `collection`. The query must return
+    its geometry column (as a geometry) named `geom`.
     
-    if rows is None:
-        return {'type': 'FeatureCollection', 'features': []}
+    The record form of ST_AsGeoJSON builds each Feature, with every other
+    column as a property, while encoding the geometry only once.
+    """
+    return """
+        SELECT json_build_object(
+            'type', 'FeatureCollection',
+            'features', COALESCE(json_agg(ST_AsGeoJSON(t.*, 'geom', 5)::json), '[]'::json)
+        )::text AS collection
+        FROM (""" + query + """) t
+        WHERE t.geom IS NOT NULL
+    """
+
+def geojson_from_query(query, params=None, wrap=True):
+    """Execute query and return a GeoJSON FeatureCollection response.
     
-    features = []
-    for row in rows:
-        properties = {k: v for k, v in row.items() if k not in ['geom', 'geometry']}
-        
-        # Handle geometry column (can be 'geom' or 'geometry')
-        geom_data = row.get('geom') or row.get('geometry')
-        
-        if geom_data:
-            try:
-                geometry = json.loads(geom_data)
-                feature = {
+    The collection is assembled by PostGIS and fetched as a single JSON
+    text value, so rows are never decoded and re-encoded in Python. Pass
+    wrap=False when query already returns a `collection` column, e.g. an
+    EXECUTE of a statement built with feature_collection_sql().
+    """
+    if wrap:
+        query = feature_collection_sql(query)
+    
+    result = execute_query(query, params, fetch_one=True)
+    
+    if result is None:
+        return fast_json({'error': 'Could not fetch features'}), 500
+    
+    return Response(result['collection'], mimetype='application/json')
+
+# One query per statistic, so /api/statistics can run them in parallel and
+# cache each value separately. Each returns a single column named `value`.
+STATISTICS_QUERIES = {
+    'total_regions': "SELECT COUNT(*) AS value FROM regions",
+    'active_stations': "SELECT COUNT(*) AS value FROM rainfall_stations WHERE active = TRUE",
+    'active_alerts': """
+        SELECT COUNT(*) AS value FROM flood_alerts
+        WHERE active = TRUE AND (expires_at IS NULL OR expires_at > NOW())
+    """,
+    'critical_zones': "SELECT COUNT(*) AS value FROM flood_risk_zones WHERE risk_level = 'critical'",
+    'high_risk_zones': "SELECT COUNT(*) AS value FROM flood_risk_zones WHERE risk_level = 'high'",
+    'avg_rainfall_24h': """
+        SELECT COALESCE(AVG(rainfall_mm), 0) AS value FROM rainfall_data
+        WHERE recorded_at > NOW() - INTERVAL '24 hours'
+    """,
+    'max_rainfall_24h': """
+        SELECT COALESCE(MAX(rainfall_mm), 0) AS value FROM rainfall_data
+        WHERE recorded_at > NOW() - INTERVAL '24 hours'
+    """,
+    'historical_floods': "SELECT COUNT(*) AS value FROM flood_history"
+}
+
+# Statements prepared once on every new pooled connection so the fixed
+# queries behind the busiest endpoints are parsed and planned only once.
+# Keys are PREPARE signatures; run them with EXECUTE <name>(...).
+PREPARED_STATEMENTS = {
+    'stmt_regions': feature_collection_sql("""
+        SELECT 
+            id, name, district, population,
+            created_at,
+            geom
+        FROM regions
+        ORDER BY name
+    """),
+    'stmt_region(integer)': """
+        SELECT 
+            r.id, r.name, r.district, r.population,
+            r.created_at,
+            ST_AsGeoJSON(r.geom, 5, 0) as geom,
+            COUNT(DISTINCT rs.id) as rainfall_stations,
+            COUNT(DISTINCT fh.id) as historical_floods
+        FROM regions r
+        LEFT JOIN rainfall_stations rs ON r.id = rs.region_id
+        LEFT JOIN flood_history fh ON r.id = fh.region_id
+        WHERE r.id = $1
+        GROUP BY r.id, r.name, r.district, r.population, r.created_at, r.geom
+    """,
+    'stmt_active_alerts': feature_collection_sql("""
+        SELECT 
+            a.id, a.alert_level, a.message,
+            a.issued_at, a.expires_at,
+            a.affected_population,
+            r.name as region_name,
+            r.district,
+            a.affected_area as geom
+        FROM flood_alerts a
+        JOIN regions r ON a.region_id = r.id
+        WHERE a.active = TRUE 
+        AND (a.expires_at IS NULL OR a.expires_at > NOW())
+        ORDER BY 
+            CASE a.alert_level
+                WHEN 'emergency' THEN 1
+                WHEN 'warning' THEN 2
+                WHEN 'watch' THEN 3
+                ELSE 4
+            END,
+            a.issued_at DESC
+    """),
+    'stmt_calc_risk(double precision, double precision)': """
+        SELECT 
+            ROUND(s::numeric, 2) as risk_score,
+            CASE
+                WHEN s >= 75 THEN 'critical'
+                WHEN s >= 50 THEN 'high'
+                WHEN s >= 25 THEN 'moderate'
+                ELSE 'low'
+            END as risk_level,
+            CASE
+                WHEN s >= 75 THEN 'Severe flood risk - immediate action required'
+                WHEN s >= 50 THEN 'High flood risk - stay alert and prepared'
+                WHEN s >= 25 THEN 'Moderate flood risk - monitor conditions'
+                ELSE 'Low flood risk'
+            END as description
+        FROM (
+            SELECT calculate_flood_risk(
+                ST_SetSRID(ST_MakePoint($1, $2), 4326)
+            ) as s
+        ) t
+    """
+}
+PREPARED_STATEMENTS.update({
+    f'stmt_stat_{name}': query for name, query in STATISTICS_QUERIES.items()
+})
+
+def prepare_statements(conn):
+    """Pool on_connect hook, run on each connection's first checkout:
+    PREPARE every statement in PREPARED_STATEMENTS.
+    A statement that fails to prepare is logged and skipped so the
+    connection stays usable for everything else."""
+    cur = conn.cursor()
+    for signature, query in PREPARED_STATEMENTS.items():
+        try:
+            cur.execute(f"PREPARE {signature} AS {query}")
+            conn.commit()
+        except psycopg2.Error as e:
+            conn.rollback()
+            print(f"Could not prepare {signature}: {e}")
+    cur.close()
+
+def json_default(obj):
+    """Serialize types orjson does not handle natively (NUMERIC columns)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dump_json(obj):
+    """Encode obj to JSON bytes with orjson"""
+    return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+
+def fast_json(obj):
+    """Return obj as a JSON response (orjson replacement for jsonify)"""
+    return Response(dump_json(obj), mimetype='application/json')
+
+def stream_encoding():
+    """First of COMPRESS_ALGORITHM the client accepts, or None"""
+    for algorithm in app.config['COMPRESS_ALGORITHM']:
+        if request.accept_encodings[algorithm]:
+            return algorithm
+    return None
+
+def compress_stream(chunks, encoding):
+    """Compress an iterable of byte chunks as they are produced, with
+    brotli ('br') or gzip at Config.COMPRESS_LEVEL"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=Config.COMPRESS_LEVEL)
+        compress, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(Config.COMPRESS_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        compress, finish = compressor.compress, compressor.flush
+    
+    try:
+        for chunk in chunks:
+            data = compress(chunk)
+            if data:
+                yield data
+        yield finish()
+    finally:
+        chunks.close()
+
+def stream_geojson(query, params=None):
+    """Execute query and stream a GeoJSON FeatureCollection response.
+    
+    Rows are read through a server-side cursor in batches of
+    Config.STREAM_ITERSIZE and written out as they arrive, so large result
+    sets are never held in memory. The body is compressed on the fly when
+    the client accepts br or gzip. The query must return its geometry as
+    GeoJSON text named `geom`.
+    """
+    def generate():
+        # Plain tuple rows: no per-row dict keyed by column name
+        with db_cursor(cursor_factory=None, name='geojson_stream') as cur:
+            cur.itersize = Config.STREAM_ITERSIZE
+            cur.execute(query, params)
+            # A named cursor only runs the query when rows are first fetched
+            first = cur.fetchone()
+            yield b'{"type":"FeatureCollection","features":['
+            
+            if first is None:
+                yield b']}'
+                return
+            
+            # Server-side cursors describe their columns once rows arrive
+            columns = [column.name for column in cur.description]
+            geom_index = columns.index('geom')
+            properties = [(i, name) for i, name in enumerate(columns) if i != geom_index]
+            
+            separator = b''
+            for row in itertools.chain((first,), cur):
+                geometry = row[geom_index]
+                if not geometry:
+                    continue
+                # Fragment writes the GeoJSON text into the output as-is,
+                # without parsing it or making an encoded copy first
+                yield separator + dump_json({
                     'type': 'Feature',
-                    'geometry': geometry,
-                    'properties': properties
-                }
-                features.append(feature)
-            except json.JSONDecodeError:
-                print(f"Invalid GeoJSON for row: {properties}")
-                continue
-    
-    return {
-        'type': 'FeatureCollection',
-        'features': features
-    }
+                    'geometry': orjson.Fragment(geometry),
+                    'properties': {name: row[i] for i, name in properties}
+                })
+                separator = b','
+            
+            yield b']}'
+    
+    features = generate()
+    try:
+        # Run the query and fetch the first batch before responding, so
+        # errors raised while planning or starting the scan become a 500.
+        # An error in a later batch can still cut the streamed body short.
+        head = next(features)
+    except Exception as e:
+        print(f"Query error: {e}")
+        return fast_json({'error': 'Could not fetch features'}), 500
+    
+    def body():
+        try:
+            yield head
+            yield from features
+        finally:
+            features.close()
+    
+    chunks = body()
+    encoding = stream_encoding()
+    if encoding:
+        chunks = compress_stream(chunks, encoding)
+    
+    response = Response(stream_with_context(chunks), mimetype='application/json')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+@app.after_request
+def add_etag(response):
+    """Tag GET responses with an ETag so clients can revalidate with If-None-Match"""
+    if (request.method == 'GET' and response.status_code == 200
+            and not response.is_streamed and not response.direct_passthrough):
+        response.add_etag()
+        response.make_conditional(request)
+    return response
+
+# Registered after add_etag so it runs first: ETags then describe the
+# compressed bytes the client actually received
+Compress(app)
+
+def public_cache(max_age):
+    """Mark a view's successful responses as cacheable by browsers and CDNs"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = make_response(view(*args, **kwargs))
+            if response.status_code in (200, 304):
+                response.cache_control.public = True
+                response.cache_control.max_age = max_age
+                # Shared caches must keep compressed and plain bodies apart
+                response.vary.add('Accept-Encoding')
+            return response
+        return wrapper
+    return decorator
+
+def is_success(rv):
+    """cache.cached response_filter: keep only 200 responses, so a failed
+    query is retried by the next request instead of being served again"""
+    return make_response(rv).status_code == 200
+
+# Fingerprints of the tables behind the geometry endpoints. Inserts and
+# deletes change the set of ids and updates change a row's xmin, so any
+# write produces a new value. The stations response also shows region names
+# and per-station measurement counts, so its fingerprint covers regions too,
+# plus the row count and newest xmin of rainfall_data, which change on any
+# insert, update or delete there.
+TABLE_VERSION_QUERIES = {
+    'regions': """
+        SELECT md5(COALESCE(string_agg(id::text || ':' || xmin::text, ',' ORDER BY id), ''))
+            AS version
+        FROM regions
+    """,
+    'water_bodies': """
+        SELECT md5(COALESCE(string_agg(id::text || ':' || xmin::text, ',' ORDER BY id), ''))
+            AS version
+        FROM water_bodies
+    """,
+    'rainfall_stations': """
+        SELECT md5(
+            (SELECT COALESCE(string_agg(id::text || ':' || xmin::text, ',' ORDER BY id), '')
+             FROM rainfall_stations)
+            || ';' || (SELECT COALESCE(string_agg(id::text || ':' || xmin::text, ',' ORDER BY id), '')
+                       FROM regions)
+            || ';' || (SELECT COUNT(*)::text || ':' || COALESCE(MAX(xmin::text::bigint), 0)::text
+                       FROM rainfall_data)
+        ) AS version
+    """
+}
+
+@cache.memoize(timeout=Config.TABLE_VERSION_CACHE_TIMEOUT)
+def table_version(table):
+    """Current fingerprint of table (see TABLE_VERSION_QUERIES), or None"""
+    result = execute_query(TABLE_VERSION_QUERIES[table], fetch_one=True)
+    return result['version'] if result else None
+
+def versioned_cache_key(table):
+    """Response cache key for a versioned view: its URL plus the current
+    table_version(table), so a table change also retires cached bodies"""
+    def make_cache_key(*args, **kwargs):
+        return f'view/{request.full_path}#{table_version(table)}'
+    return make_cache_key
+
+def matching_etag(etag):
+    """The form of etag named in If-None-Match, or None. A client may send
+    etag as issued or with the ":<algorithm>" suffix Flask-Compress adds
+    to compressed responses."""
+    candidates = [etag] + [f'{etag}:{algorithm}' for algorithm in app.config['COMPRESS_ALGORITHM']]
+    for candidate in candidates:
+        if request.if_none_match.contains_weak(candidate):
+            return candidate
+    return None
+
+def versioned(table):
+    """Use table_version(table) as the view's weak ETag and answer a matching
+    If-None-Match with 304 before the view or its response cache runs"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = table_version(table)
+            if etag is None:
+                return view(*args, **kwargs)
+            
+            matched = matching_etag(etag)
+            if matched:
+                response = Response(status=304)
+                response.set_etag(matched, weak=True)
+                return response
+            
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag, weak=True)
+            return response
+        return wrapper
+    return decorator
 
 # ============================================
 # API ENDPOINTS
 # ============================================
 
+# Vector tile layers served by /api/tiles, keyed by table name (which is also
+# the table_version key used to version cached tiles)
+TILE_LAYER_QUERIES = {
+    'regions': """
+        SELECT ST_AsMVT(q, 'regions', 4096, 'geom') AS tile
+        FROM (
+            SELECT 
+                r.id, r.name, r.district, r.population,
+                ST_AsMVTGeom(ST_Transform(r.geom, 3857), b.envelope, 4096, 64, true) AS geom
+            FROM regions r,
+                (SELECT ST_TileEnvelope(%(z)s, %(x)s, %(y)s) AS envelope) b
+            WHERE r.geom && ST_Transform(b.envelope, 4326)
+        ) q
+    """,
+    'water_bodies': """
+        SELECT ST_AsMVT(q, 'water_bodies', 4096, 'geom') AS tile
+        FROM (
+            SELECT 
+                w.id, w.name, w.type, w.buffer_zone_m,
+                ST_AsMVTGeom(ST_Transform(w.geom, 3857), b.envelope, 4096, 64, true) AS geom
+            FROM water_bodies w,
+                (SELECT ST_TileEnvelope(%(z)s, %(x)s, %(y)s) AS envelope) b
+            WHERE w.geom && ST_Transform(b.envelope, 4326)
+        ) q
+    """
+}
+
+def prune_tile_versions(layer, keep):
+    """Delete the cached tiles of every version of layer except keep"""
+    layer_dir = os.path.join(Config.TILE_CACHE_DIR, layer)
+    for name in os.listdir(layer_dir):
+        if name != keep:
+            shutil.rmtree(os.path.join(layer_dir, name), ignore_errors=True)
+
+def load_tile(layer, version, z, x, y):
+    """Return the MVT bytes for a tile, from the disk cache when this
+    version of the layer has already been rendered"""
+    version_dir = os.path.join(Config.TILE_CACHE_DIR, layer, version)
+    path = os.path.join(version_dir, str(z), str(x), f'{y}.mvt')
+    
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    
+    result = execute_query(TILE_LAYER_QUERIES[layer], {'z': z, 'x': x, 'y': y}, fetch_one=True)
+    if result is None:
+        return None
+    tile = bytes(result['tile'])
+    
+    try:
+        os.makedirs(os.path.dirname(version_dir), exist_ok=True)
+        try:
+            os.mkdir(version_dir)
+        except FileExistsError:
+            pass
+        else:
+            # First tile of a new version: the older versions are stale
+            prune_tile_versions(layer, version)
+        
+        # Write then rename so concurrent readers never see a partial tile
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(tile)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # e.g. another worker pruned this version meanwhile; serve it uncached
+        print(f"Could not cache tile: {e}")
+    
+    return tile
+
+# Constant payloads, encoded once at import time
+HOME_JSON = dump_json({
+    'name': 'Flood Alert System API',
+    'version': '1.0.0',
+    'description': 'Real-time flood risk monitoring for Malawi',
+    'endpoints': {
+        'GET /api/health': 'Check API health',
+        'GET /api/regions': 'Get all regions',
+        'GET /api/regions/<id>': 'Get specific region',
+        'GET /api/risk-zones': 'Get flood risk zones',
+        'GET /api/alerts': 'Get flood alerts',
+        'GET /api/alerts/active': 'Get active alerts only',
+        'GET /api/rainfall': 'Get rainfall data',
+        'GET /api/rainfall/stations': 'Get all rainfall stations',
+        'GET /api/water-bodies': 'Get water bodies',
+        'GET /api/elevation': 'Get elevation data',
+        'GET /api/statistics': 'Get system statistics',
+        'GET /api/tiles/<layer>/<z>/<x>/<y>.mvt': 'Get a vector tile (regions, water_bodies)',
+        'GET /api/docs': 'Get API documentation',
+        'POST /api/calculate-risk': 'Calculate flood risk for coordinates',
+        'POST /api/rainfall/add': 'Add new rainfall measurement',
+        'POST /api/rainfall/add-bulk': 'Add a batch of rainfall measurements',
+        'POST /api/update-risk-zones': 'Update risk zones for region',
+        'POST /api/alerts/create': 'Create new alert'
+    }
+})
+API_DOCS_JSON = dump_json(API_DOCS)
+
 @app.route('/')
 def home():
     """API documentation and welcome"""
-    return jsonify({
-        'name': 'Flood Alert System API',
-        'version': '1.0.0',
-        'description': 'Real-time flood risk monitoring for Malawi',
-        'endpoints': {
-            'GET /api/health': 'Check API health',
-            'GET /api/regions': 'Get all regions',
-            'GET /api/regions/<id>': 'Get specific region',
-            'GET /api/risk-zones': 'Get flood risk zones',
-            'GET /api/alerts': 'Get flood alerts',
-            'GET /api/alerts/active': 'Get active alerts only',
-            'GET /api/rainfall': 'Get rainfall data',
-            'GET /api/rainfall/stations': 'Get all rainfall stations',
-            'GET /api/water-bodies': 'Get water bodies',
-            'GET /api/elevation': 'Get elevation data',
-            'GET /api/statistics': 'Get system statistics',
-            'POST /api/calculate-risk': 'Calculate flood risk for coordinates',
-            'POST /api/rainfall/add': 'Add new rainfall measurement',
-            'POST /api/update-risk-zones': 'Update risk zones for region',
-            'POST /api/alerts/create': 'Create new alert'
-        }
-    })
+    return Response(HOME_JSON, mimetype='application/json')
+
+@app.route('/api/docs')
+def get_api_docs():
+    """Endpoint reference from api_docs.py"""
+    return Response(API_DOCS_JSON, mimetype='application/json')
 
 @app.route('/api/health')
+@cache.cached(timeout=Config.HEALTH_CACHE_TIMEOUT)
 def health_check():
-    """Check if API and database are working"""
-    conn = get_db_connection()
-    if conn:
-        try:
-            cur = conn.cursor()
-            cur.execute('SELECT 1')
-            cur.close()
-            conn.close()
-            return jsonify({
+    """Check if API and database are working.
+    
+    Only every HEALTH_QUERY_INTERVAL-th check runs SELECT 1; the others just
+    confirm the connection pool is open, so load balancer probes do not
+    compete with requests for connections.
+    """
+    if next(HEALTH_CHECKS) % Config.HEALTH_QUERY_INTERVAL and Config.POOL is not None:
+        if not Config.POOL.closed:
+            return fast_json({
                 'status': 'healthy',
                 'database': 'connected',
                 'timestamp': datetime.now().isoformat()
             })
-        except:
-            return jsonify({
-                'status': 'unhealthy',
-                'database': 'error',
-                'timestamp': datetime.now().isoformat()
-            }), 500
-    else:
-        return jsonify({
+        return fast_json({
             'status': 'unhealthy',
             'database': 'disconnected',
             'timestamp': datetime.now().isoformat()
         }), 500
+    
+    try:
+        with db_cursor(cursor_factory=None) as cur:
+            cur.execute('SELECT 1')
+        return fast_json({
+            'status': 'healthy',
+            'database': 'connected',
+            'timestamp': datetime.now().isoformat()
+        })
+    except psycopg2.OperationalError:
+        return fast_json({
+            'status': 'unhealthy',
+            'database': 'disconnected',
+            'timestamp': datetime.now().isoformat()
+        }), 500
+    except Exception:
+        return fast_json({
+            'status': 'unhealthy',
+            'database': 'error',
+            'timestamp': datetime.now().isoformat()
+        }), 500
 
 @app.route('/api/regions', methods=['GET'])
+@public_cache(max_age=Config.GEOMETRY_MAX_AGE)
+@versioned('regions')
+@cache.cached(timeout=Config.GEOMETRY_CACHE_TIMEOUT, make_cache_key=versioned_cache_key('regions'),
+              response_filter=is_success)
 def get_regions():
     """Get all regions with their boundaries"""
-    query = """
-        SELECT 
-            id, name, district, population,
-            created_at,
-            ST_AsGeoJSON(geom) as geom
-        FROM regions
-        ORDER BY name
-    """
-    return jsonify(geojson_from_query(query))
+    return geojson_from_query('EXECUTE stmt_regions', wrap=False)
 
 @app.route('/api/regions/<int:region_id>', methods=['GET'])
 def get_region(region_id):
     """Get specific region details"""
-    query = """
-        SELECT 
-            r.id, r.name, r.district, r.population,
-            r.created_at,
-            ST_AsGeoJSON(r.geom) as geom,
-            COUNT(DISTINCT rs.id) as rainfall_stations,
-            COUNT(DISTINCT fh.id) as historical_floods
-        FROM regions r
-        LEFT JOIN rainfall_stations rs ON r.id = rs.region_id
-        LEFT JOIN flood_history fh ON r.id = fh.region_id
-        WHERE r.id = %s
-        GROUP BY r.id, r.name, r.district, r.population, r.created_at, r.geom
-    """
-    result = execute_query(query, (region_id,), fetch_one=True)
+    result = execute_query('EXECUTE stmt_region(%s)', (region_id,), fetch_one=True)
     
     if result:
         data = dict(result)
         if data.get('geom'):
-            data['geometry'] = json.loads(data['geom'])
-            del data['geom']
-        return jsonify(data)
+            data['geometry'] = orjson.Fragment(data.pop('geom'))
+        return fast_json(data)
     else:
-        return jsonify({'error': 'Region not found'}), 404
+        return fast_json({'error': 'Region not found'}), 404
 
 @app.route('/api/risk-zones', methods=['GET'])
 def get_risk_zones():
@@ -193,9 +653,8 @@ def get_risk_zones():
     query = """
         SELECT 
             id, risk_level, risk_score, 
-            factors, calculated_at, region_id,
-            ST_AsGeoJSON(geom) as geom
-        FROM flood_risk_zones
+            factors, calculated_at, region_id, geom
+        FROM flood_risk_zones_mv
         WHERE 1=1
     """
     params = []
@@ -214,7 +673,7 @@ def get_risk_zones():
     
     query += " ORDER BY risk_score DESC, calculated_at DESC"
     
-    return jsonify(geojson_from_query(query, params if params else None))
+    return stream_geojson(query, params if params else None)
 
 @app.route('/api/alerts', methods=['GET'])
 def get_alerts():
@@ -229,7 +688,7 @@ def get_alerts():
             a.affected_population,
             r.name as region_name,
             r.district,
-            ST_AsGeoJSON(a.affected_area) as geom
+            a.affected_area as geom
         FROM flood_alerts a
         JOIN regions r ON a.region_id = r.id
         WHERE 1=1
@@ -240,33 +699,12 @@ def get_alerts():
     
     query += " ORDER BY a.issued_at DESC LIMIT %s"
     
-    return jsonify(geojson_from_query(query, (limit,)))
+    return geojson_from_query(query, (limit,))
 
 @app.route('/api/alerts/active', methods=['GET'])
 def get_active_alerts():
     """Get only active alerts"""
-    query = """
-        SELECT 
-            a.id, a.alert_level, a.message,
-            a.issued_at, a.expires_at,
-            a.affected_population,
-            r.name as region_name,
-            r.district,
-            ST_AsGeoJSON(a.affected_area) as geom
-        FROM flood_alerts a
-        JOIN regions r ON a.region_id = r.id
-        WHERE a.active = TRUE 
-        AND (a.expires_at IS NULL OR a.expires_at > NOW())
-        ORDER BY 
-            CASE a.alert_level
-                WHEN 'emergency' THEN 1
-                WHEN 'warning' THEN 2
-                WHEN 'watch' THEN 3
-                ELSE 4
-            END,
-            a.issued_at DESC
-    """
-    return jsonify(geojson_from_query(query))
+    return geojson_from_query('EXECUTE stmt_active_alerts', wrap=False)
 
 @app.route('/api/rainfall', methods=['GET'])
 def get_rainfall():
@@ -282,14 +720,14 @@ def get_rainfall():
             rs.name as station_name,
             rs.station_code,
             r.name as region_name,
-            ST_AsGeoJSON(rs.geom) as geom
+            ST_AsGeoJSON(rs.geom, 5, 0) as geom
         FROM rainfall_data rd
         JOIN rainfall_stations rs ON rd.station_id = rs.id
         LEFT JOIN regions r ON rs.region_id = r.id
-        WHERE rd.recorded_at > NOW() - INTERVAL '%s hours'
-    """ % hours
+        WHERE rd.recorded_at > NOW() - (INTERVAL '1 hour' * %s)
+    """
     
-    params = []
+    params = [hours]
     if station_id:
         query += " AND rd.station_id = %s"
         params.append(station_id)
@@ -300,27 +738,41 @@ def get_rainfall():
     
     query += " ORDER BY rd.recorded_at DESC"
     
-    return jsonify(geojson_from_query(query, params if params else None))
+    return stream_geojson(query, params)
 
 @app.route('/api/rainfall/stations', methods=['GET'])
+@public_cache(max_age=Config.GEOMETRY_MAX_AGE)
+@versioned('rainfall_stations')
+@cache.cached(timeout=Config.GEOMETRY_CACHE_TIMEOUT, make_cache_key=versioned_cache_key('rainfall_stations'),
+              response_filter=is_success)
 def get_rainfall_stations():
     """Get all rainfall stations"""
     query = """
         SELECT 
             rs.id, rs.name, rs.station_code, rs.active,
             r.name as region_name,
-            ST_AsGeoJSON(rs.geom) as geom,
-            COUNT(rd.id) as total_measurements,
-            MAX(rd.recorded_at) as last_measurement
+            rs.geom,
+            agg.total_measurements,
+            agg.last_measurement
         FROM rainfall_stations rs
         LEFT JOIN regions r ON rs.region_id = r.id
-        LEFT JOIN rainfall_data rd ON rs.id = rd.station_id
-        GROUP BY rs.id, rs.name, rs.station_code, rs.active, r.name, rs.geom
+        LEFT JOIN LATERAL (
+            -- Per-station aggregate served by rainfall_data_station_time
+            SELECT 
+                COUNT(*) as total_measurements,
+                MAX(rd.recorded_at) as last_measurement
+            FROM rainfall_data rd
+            WHERE rd.station_id = rs.id
+        ) agg ON TRUE
         ORDER BY rs.name
     """
-    return jsonify(geojson_from_query(query))
+    return geojson_from_query(query)
 
 @app.route('/api/water-bodies', methods=['GET'])
+@public_cache(max_age=Config.GEOMETRY_MAX_AGE)
+@versioned('water_bodies')
+@cache.cached(timeout=Config.GEOMETRY_CACHE_TIMEOUT, make_cache_key=versioned_cache_key('water_bodies'),
+              response_filter=is_success)
 def get_water_bodies():
     """Get water bodies (rivers, lakes)"""
     water_type = request.args.get('type')
@@ -328,7 +780,7 @@ def get_water_bodies():
     query = """
         SELECT 
             id, name, type, buffer_zone_m, created_at,
-            ST_AsGeoJSON(geom) as geom
+            geom
         FROM water_bodies
         WHERE 1=1
     """
@@ -340,7 +792,7 @@ def get_water_bodies():
     
     query += " ORDER BY name"
     
-    return jsonify(geojson_from_query(query, params if params else None))
+    return geojson_from_query(query, params if params else None)
 
 @app.route('/api/elevation', methods=['GET'])
 def get_elevation():
@@ -352,7 +804,7 @@ def get_elevation():
         SELECT 
             e.id, e.elevation_m,
             r.name as region_name,
-            ST_AsGeoJSON(e.geom) as geom
+            ST_AsGeoJSON(e.geom, 5, 0) as geom
         FROM elevation e
         LEFT JOIN regions r ON e.region_id = r.id
         WHERE 1=1
@@ -369,32 +821,104 @@ def get_elevation():
     
     query += " ORDER BY e.elevation_m"
     
-    return jsonify(geojson_from_query(query, params if params else None))
+    return stream_geojson(query, params if params else None)
+
+@cache.memoize(timeout=Config.STATISTICS_CACHE_TIMEOUT)
+def fetch_statistic(name):
+    """Run one statistics query (memoized per statistic, see invalidate_statistics)"""
+    result = execute_query(f'EXECUTE stmt_stat_{name}', fetch_one=True)
+    return result['value'] if result else None
+
+def fetch_statistic_in_context(name):
+    """fetch_statistic for executor threads, which have no app context"""
+    with app.app_context():
+        return fetch_statistic(name)
+
+def invalidate_statistics(*names):
+    """Drop the cached values of the given statistics"""
+    for name in names:
+        cache.delete_memoized(fetch_statistic, name)
+
+@app.route('/api/tiles/<layer>/<int:z>/<int:x>/<int:y>.mvt', methods=['GET'])
+@public_cache(max_age=Config.GEOMETRY_MAX_AGE)
+def get_tile(layer, z, x, y):
+    """Get a Mapbox Vector Tile of a map layer"""
+    if layer not in TILE_LAYER_QUERIES or not 0 <= z <= Config.MAX_TILE_ZOOM:
+        abort(404)
+    if not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        abort(404)
+    
+    # Tiles are cached per layer version, so any write to the layer's table
+    # moves readers on to freshly rendered tiles
+    version = table_version(layer)
+    if version is None:
+        return fast_json({'error': 'Could not render tile'}), 500
+    
+    matched = matching_etag(version)
+    if matched:
+        response = Response(status=304)
+        response.set_etag(matched, weak=True)
+        return response
+    
+    tile = load_tile(layer, version, z, x, y)
+    if tile is None:
+        return fast_json({'error': 'Could not render tile'}), 500
+    response = Response(tile, mimetype='application/x-protobuf')
+    response.set_etag(version, weak=True)
+    return response
 
 @app.route('/api/statistics', methods=['GET'])
 def get_statistics():
     """Get system statistics"""
-    query = """
-        SELECT 
-            (SELECT COUNT(*) FROM regions) as total_regions,
-            (SELECT COUNT(*) FROM rainfall_stations WHERE active = TRUE) as active_stations,
-            (SELECT COUNT(*) FROM flood_alerts WHERE active = TRUE 
-             AND (expires_at IS NULL OR expires_at > NOW())) as active_alerts,
-            (SELECT COUNT(*) FROM flood_risk_zones WHERE risk_level = 'critical') as critical_zones,
-            (SELECT COUNT(*) FROM flood_risk_zones WHERE risk_level = 'high') as high_risk_zones,
-            (SELECT COALESCE(AVG(rainfall_mm), 0) FROM rainfall_data 
-             WHERE recorded_at > NOW() - INTERVAL '24 hours') as avg_rainfall_24h,
-            (SELECT COALESCE(MAX(rainfall_mm), 0) FROM rainfall_data 
-             WHERE recorded_at > NOW() - INTERVAL '24 hours') as max_rainfall_24h,
-            (SELECT COUNT(*) FROM flood_history) as historical_floods
-    """
-    
-    result = execute_query(query, fetch_one=True)
+    futures = {
+        name: STATISTICS_EXECUTOR.submit(fetch_statistic_in_context, name)
+        for name in STATISTICS_QUERIES
+    }
+    result = {name: future.result() for name, future in futures.items()}
     
-    if result:
-        return jsonify(dict(result))
+    if None not in result.values():
+        return fast_json(result)
     else:
-        return jsonify({'error': 'Could not fetch statistics'}), 500
+        return fast_json({'error': 'Could not fetch statistics'}), 500
+
+@cache.memoize(timeout=Config.RISK_CACHE_TIMEOUT)
+def fetch_flood_risk(lat, lng):
+    """Score and classify the flood risk at a point (memoized per coordinate pair)"""
+    result = execute_query('EXECUTE stmt_calc_risk(%s, %s)', (lng, lat), fetch_one=True)
+    
+    if result and result['risk_score'] is not None:
+        return dict(result)
+    return None
+
+def coalesced_flood_risk(lat, lng):
+    """fetch_flood_risk with single-flight semantics: while one request is
+    computing a point, concurrent requests for it wait for that result
+    instead of running calculate_flood_risk() again"""
+    key = (lat, lng)
+    with RISK_INFLIGHT_LOCK:
+        future = RISK_INFLIGHT.get(key)
+        leader = future is None
+        if leader:
+            future = RISK_INFLIGHT[key] = Future()
+    
+    if leader:
+        try:
+            future.set_result(fetch_flood_risk(lat, lng))
+        except Exception as e:
+            future.set_exception(e)
+        except BaseException:
+            # e.g. the request's greenlet was killed: release the waiters too
+            future.set_exception(RuntimeError('Risk calculation was interrupted'))
+            raise
+        finally:
+            with RISK_INFLIGHT_LOCK:
+                del RISK_INFLIGHT[key]
+    
+    try:
+        return future.result(timeout=Config.RISK_COALESCE_TIMEOUT)
+    except Exception as e:
+        print(f"Risk calculation error: {e!r}")
+        return None
 
 @app.route('/api/calculate-risk', methods=['POST'])
 def calculate_risk():
@@ -402,56 +926,33 @@ def calculate_risk():
     data = request.get_json()
     
     if not data:
-        return jsonify({'error': 'No data provided'}), 400
+        return fast_json({'error': 'No data provided'}), 400
     
     lat = data.get('lat')
     lng = data.get('lng')
     
     if not lat or not lng:
-        return jsonify({'error': 'lat and lng required'}), 400
+        return fast_json({'error': 'lat and lng required'}), 400
     
     try:
         lat = float(lat)
         lng = float(lng)
     except ValueError:
-        return jsonify({'error': 'Invalid coordinates'}), 400
+        return fast_json({'error': 'Invalid coordinates'}), 400
     
-    query = """
-        SELECT calculate_flood_risk(
-            ST_SetSRID(ST_MakePoint(%s, %s), 4326)
-        ) as risk_score
-    """
+    # Nearby points (~11 m) share one cached result
+    risk = coalesced_flood_risk(round(lat, 4), round(lng, 4))
     
-    result = execute_query(query, (lng, lat), fetch_one=True)
-    
-    if result and result['risk_score'] is not None:
-        risk_score = float(result['risk_score'])
-        
-        # Determine risk level
-        if risk_score >= 75:
-            risk_level = 'critical'
-            risk_description = 'Severe flood risk - immediate action required'
-        elif risk_score >= 50:
-            risk_level = 'high'
-            risk_description = 'High flood risk - stay alert and prepared'
-        elif risk_score >= 25:
-            risk_level = 'moderate'
-            risk_description = 'Moderate flood risk - monitor conditions'
-        else:
-            risk_level = 'low'
-            risk_description = 'Low flood risk'
-        
-        return jsonify({
+    if risk is not None:
+        return fast_json({
             'success': True,
             'lat': lat,
             'lng': lng,
-            'risk_score': round(risk_score, 2),
-            'risk_level': risk_level,
-            'description': risk_description,
+            **risk,
             'calculated_at': datetime.now().isoformat()
         })
     else:
-        return jsonify({
+        return fast_json({
             'success': False,
             'error': 'Could not calculate risk - insufficient data'
         }), 500
@@ -462,34 +963,29 @@ def add_rainfall():
     data = request.get_json()
     
     if not data:
-        return jsonify({'error': 'No data provided'}), 400
+        return fast_json({'error': 'No data provided'}), 400
     
     station_id = data.get('station_id')
     rainfall_mm = data.get('rainfall_mm')
     duration_hours = data.get('duration_hours', 1)
     
     if not station_id or rainfall_mm is None:
-        return jsonify({'error': 'station_id and rainfall_mm required'}), 400
-    
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'error': 'Database connection failed'}), 500
+        return fast_json({'error': 'station_id and rainfall_mm required'}), 400
     
     try:
-        cur = conn.cursor()
-        cur.execute("""
-            INSERT INTO rainfall_data 
-            (station_id, recorded_at, rainfall_mm, duration_hours)
-            VALUES (%s, NOW(), %s, %s)
-            RETURNING id, recorded_at
-        """, (station_id, rainfall_mm, duration_hours))
+        with db_cursor(cursor_factory=None) as cur:
+            cur.execute("""
+                INSERT INTO rainfall_data 
+                (station_id, recorded_at, rainfall_mm, duration_hours)
+                VALUES (%s, NOW(), %s, %s)
+                RETURNING id, recorded_at
+            """, (station_id, rainfall_mm, duration_hours))
+            result = cur.fetchone()
         
-        result = cur.fetchone()
-        conn.commit()
-        cur.close()
-        conn.close()
+        invalidate_statistics('avg_rainfall_24h', 'max_rainfall_24h')
+        cache.delete_memoized(table_version, 'rainfall_stations')
         
-        return jsonify({
+        return fast_json({
             'success': True,
             'id': result[0],
             'recorded_at': result[1].isoformat(),
@@ -498,9 +994,50 @@ def add_rainfall():
         })
         
     except Exception as e:
-        conn.rollback()
-        conn.close()
-        return jsonify({'error': str(e)}), 500
+        return fast_json({'error': str(e)}), 500
+
+@app.route('/api/rainfall/add-bulk', methods=['POST'])
+def add_rainfall_bulk():
+    """Add a batch of rainfall measurements in a single transaction"""
+    data = request.get_json()
+    
+    if not data:
+        return fast_json({'error': 'No data provided'}), 400
+    
+    measurements = data.get('measurements')
+    
+    if not isinstance(measurements, list) or not measurements:
+        return fast_json({'error': 'measurements list required'}), 400
+    
+    if len(measurements) > Config.MAX_BULK_MEASUREMENTS:
+        return fast_json({
+            'error': f'At most {Config.MAX_BULK_MEASUREMENTS} measurements per request'
+        }), 400
+    
+    values = []
+    for m in measurements:
+        if not isinstance(m, dict) or not m.get('station_id') or m.get('rainfall_mm') is None:
+            return fast_json({'error': 'station_id and rainfall_mm required for every measurement'}), 400
+        values.append((m['station_id'], m['rainfall_mm'], m.get('duration_hours', 1)))
+    
+    try:
+        with db_cursor(cursor_factory=None) as cur:
+            execute_values(cur, """
+                INSERT INTO rainfall_data 
+                (station_id, recorded_at, rainfall_mm, duration_hours)
+                VALUES %s
+            """, values, template="(%s, NOW(), %s, %s)", page_size=Config.BULK_PAGE_SIZE)
+        
+        invalidate_statistics('avg_rainfall_24h', 'max_rainfall_24h')
+        cache.delete_memoized(table_version, 'rainfall_stations')
+        
+        return fast_json({
+            'success': True,
+            'inserted': len(values)
+        })
+        
+    except Exception as e:
+        return fast_json({'error': str(e)}), 500
 
 @app.route('/api/alerts/create', methods=['POST'])
 def create_alert():
@@ -508,7 +1045,7 @@ def create_alert():
     data = request.get_json()
     
     if not data:
-        return jsonify({'error': 'No data provided'}), 400
+        return fast_json({'error': 'No data provided'}), 400
     
     region_id = data.get('region_id')
     alert_level = data.get('alert_level', 'warning')
@@ -516,30 +1053,24 @@ def create_alert():
     duration_hours = data.get('duration_hours', 24)
     
     if not region_id or not message:
-        return jsonify({'error': 'region_id and message required'}), 400
-    
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'error': 'Database connection failed'}), 500
+        return fast_json({'error': 'region_id and message required'}), 400
     
     try:
-        cur = conn.cursor()
-        cur.execute("""
-            INSERT INTO flood_alerts 
-            (region_id, alert_level, message, affected_area, expires_at)
-            SELECT 
-                %s, %s, %s, geom,
-                NOW() + INTERVAL '%s hours'
-            FROM regions WHERE id = %s
-            RETURNING id, issued_at, expires_at
-        """, (region_id, alert_level, message, duration_hours, region_id))
+        with db_cursor(cursor_factory=None) as cur:
+            cur.execute("""
+                INSERT INTO flood_alerts 
+                (region_id, alert_level, message, affected_area, expires_at)
+                SELECT 
+                    %s, %s, %s, geom,
+                    NOW() + (INTERVAL '1 hour' * %s)
+                FROM regions WHERE id = %s
+                RETURNING id, issued_at, expires_at
+            """, (region_id, alert_level, message, duration_hours, region_id))
+            result = cur.fetchone()
         
-        result = cur.fetchone()
-        conn.commit()
-        cur.close()
-        conn.close()
+        invalidate_statistics('active_alerts')
         
-        return jsonify({
+        return fast_json({
             'success': True,
             'alert_id': result[0],
             'issued_at': result[1].isoformat(),
@@ -547,21 +1078,41 @@ def create_alert():
         })
         
     except Exception as e:
-        conn.rollback()
-        conn.close()
-        return jsonify({'error': str(e)}), 500
+        return fast_json({'error': str(e)}), 500
+
+@app.route('/api/update-risk-zones', methods=['POST'])
+def update_risk_zones():
+    """Refresh the precomputed risk zone features served by /api/risk-zones"""
+    try:
+        with db_cursor(cursor_factory=None) as cur:
+            cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY flood_risk_zones_mv")
+        
+        return fast_json({
+            'success': True,
+            'refreshed_at': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        return fast_json({'error': str(e)}), 500
 
 # Error handlers
+NOT_FOUND_JSON = dump_json({'error': 'Endpoint not found'})
+INTERNAL_ERROR_JSON = dump_json({'error': 'Internal server error'})
+
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({'error': 'Endpoint not found'}), 404
+    return Response(NOT_FOUND_JSON, status=404, mimetype='application/json')
 
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({'error': 'Internal server error'}), 500
+    return Response(INTERNAL_ERROR_JSON, status=500, mimetype='application/json')
 
-# Run the application
+# Run the development server (production runs under gunicorn, see wsgi.py)
 if __name__ == '__main__':
+    if os.environ.get('FLASK_ENV', 'development') != 'development':
+        sys.exit("Refusing to start the development server outside FLASK_ENV=development; "
+                 "use: gunicorn -c gunicorn.conf.py wsgi:app")
+    
     print("=" * 50)
     print("Flood Alert System API")
     print("=" * 50)
@@ -3,6 +3,81 @@ Configuration file for Flood Alert System
 """
 
 import os
+import threading
+from psycopg2 import extensions, pool
+
+
+class PooledConnection(extensions.connection):
+    """psycopg2 connection that records whether the pool's on_connect hook
+    has run on it"""
+    setup_done = False
+
+
+class BlockingConnectionPool(pool.ThreadedConnectionPool):
+    """ThreadedConnectionPool that waits for a free connection instead of
+    raising PoolError as soon as every connection is checked out, and runs
+    an optional on_connect(conn) hook once per connection, the first time
+    it is checked out"""
+    
+    def __init__(self, minconn, maxconn, *args, timeout=None, on_connect=None, **kwargs):
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._timeout = timeout
+        self._on_connect = on_connect
+        kwargs.setdefault('connection_factory', PooledConnection)
+        super().__init__(minconn, maxconn, *args, **kwargs)
+    
+    def getconn(self, key=None):
+        if not self._slots.acquire(timeout=self._timeout):
+            raise pool.PoolError("timed out waiting for a pooled connection")
+        try:
+            conn = super().getconn(key)
+        except Exception:
+            self._slots.release()
+            raise
+        
+        # Runs outside the pool lock, so slow setup on one new connection
+        # does not hold up checkouts of connections that are already set up
+        if self._on_connect and not conn.setup_done:
+            try:
+                self._on_connect(conn)
+            except BaseException:
+                self.putconn(conn, close=True)
+                raise
+            conn.setup_done = True
+        return conn
+    
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._slots.release()
+    
+    def _putconn(self, conn, key=None, close=False):
+        # The base class closes returned connections once minconn are idle,
+        # which reconnects on almost every checkout under load. Keep every
+        # healthy connection instead (at most maxconn exist anyway).
+        if self.closed:
+            raise pool.PoolError("connection pool is closed")
+        
+        if key is None:
+            key = self._rused.get(id(conn))
+            if key is None:
+                raise pool.PoolError("trying to put unkeyed connection")
+        
+        if not close and not conn.closed:
+            status = conn.info.transaction_status
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                conn.close()
+            else:
+                if status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                self._pool.append(conn)
+        elif not conn.closed:
+            conn.close()
+        
+        del self._used[key]
+        del self._rused[id(conn)]
+
 
 class Config:
     """Database and API configuration"""
@@ -16,11 +91,50 @@ class Config:
         'port': '5432'
     }
     
+    # Connection pool (created lazily on first use, see get_pool)
+    POOL = None
+    POOL_LOCK = threading.Lock()
+    POOL_MIN_CONN = 2
+    POOL_MAX_CONN = int(os.environ.get('POOL_MAX_CONN', 15))  # per gunicorn worker, see gunicorn.conf.py
+    POOL_TIMEOUT = 10  # seconds to wait for a free connection
+    
+    # Rows fetched per round-trip when streaming large GeoJSON responses
+    STREAM_ITERSIZE = 1000
+    
     # API Configuration
     API_HOST = '0.0.0.0'
     API_PORT = 5000
     DEBUG = True
     
+    # Response cache (Flask-Caching): shared between gunicorn workers via Redis
+    # when REDIS_URL is set, otherwise a per-process in-memory cache
+    REDIS_URL = os.environ.get('REDIS_URL')
+    CACHE_CONFIG = {
+        'CACHE_TYPE': os.environ.get('CACHE_TYPE', 'RedisCache' if REDIS_URL else 'SimpleCache'),
+        'CACHE_REDIS_URL': REDIS_URL,
+        'CACHE_DEFAULT_TIMEOUT': 300
+    }
+    GEOMETRY_CACHE_TIMEOUT = 300  # regions, stations, water bodies
+    GEOMETRY_MAX_AGE = 300  # client/CDN lifetime before revalidating boundaries by ETag
+    TABLE_VERSION_CACHE_TIMEOUT = 10  # how long a table fingerprint (ETag) is reused
+    STATISTICS_CACHE_TIMEOUT = 60
+    RISK_CACHE_TIMEOUT = 60
+    RISK_COALESCE_TIMEOUT = 30  # longest a request waits on another's identical calculation
+    
+    # Vector tiles (/api/tiles): rendered tiles are cached on disk per layer
+    # version; older versions are deleted when a new one is first rendered
+    TILE_CACHE_DIR = os.environ.get(
+        'TILE_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tile_cache')
+    )
+    MAX_TILE_ZOOM = 18
+    
+    # Response compression (Flask-Compress): brotli preferred, gzip fallback
+    COMPRESS_LEVEL = 4
+    
+    # Health checks: run SELECT 1 on every Nth probe, cache each answer briefly
+    HEALTH_QUERY_INTERVAL = 10
+    HEALTH_CACHE_TIMEOUT = 2
+    
     # CORS Configuration (allows frontend to connect)
     CORS_ORIGINS = ['*']  # In production, specify exact domains
     
@@ -28,11 +142,32 @@ class Config:
     DEFAULT_PAGE_SIZE = 50
     MAX_PAGE_SIZE = 100
     
+    # Bulk rainfall uploads
+    MAX_BULK_MEASUREMENTS = 10000
+    BULK_PAGE_SIZE = 1000  # rows per INSERT statement
+    
     # Alert thresholds
     RAINFALL_THRESHOLD = 50.0  # mm in 24 hours
     CRITICAL_RISK_THRESHOLD = 75.0
     HIGH_RISK_THRESHOLD = 50.0
     
+    @staticmethod
+    def get_pool(on_connect=None):
+        """Get the shared PostgreSQL connection pool, creating it on first use.
+        A newly created pool runs on_connect(conn) on each connection before
+        it is first handed out."""
+        if Config.POOL is None:
+            with Config.POOL_LOCK:
+                if Config.POOL is None:
+                    Config.POOL = BlockingConnectionPool(
+                        minconn=Config.POOL_MIN_CONN,
+                        maxconn=Config.POOL_MAX_CONN,
+                        timeout=Config.POOL_TIMEOUT,
+                        on_connect=on_connect,
+                        **Config.DB_CONFIG
+                    )
+        return Config.POOL
+    
     @staticmethod
     def get_db_connection_string():
         """Get PostgreSQL connection string"""
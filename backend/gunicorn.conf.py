@@ -0,0 +1,37 @@
+"""
+Gunicorn configuration for Flood Alert System API
+
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+
+# Async workers: every endpoint waits on PostgreSQL, so one greenlet per
+# request lets a worker keep serving while others wait on the database
+worker_class = 'gevent'
+# Each worker has its own connection pool of up to POOL_MAX_CONN (config.py),
+# so workers * POOL_MAX_CONN must stay below PostgreSQL's max_connections
+# (100 by default, a few of them reserved for superusers): 5 * 15 = 75
+workers = int(os.environ.get('GUNICORN_WORKERS', 5))
+worker_connections = 1000
+keepalive = 5
+
+
+def post_worker_init(worker):
+    """Make psycopg2 cooperative in every gevent worker.
+    
+    wsgi.py already does this, but a worker started straight from app:app
+    would otherwise block its whole event loop on each database round-trip.
+    Checks the running worker, since -k on the command line overrides
+    worker_class above.
+    """
+    try:
+        from gunicorn.workers.ggevent import GeventWorker
+    except ImportError:  # gevent not installed, so not a gevent worker
+        return
+    
+    if isinstance(worker, GeventWorker):
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
@@ -0,0 +1,15 @@
+"""
+WSGI entry point for production deployments
+
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+# Patch the standard library and psycopg2 before anything opens a socket so
+# that database round-trips yield to other greenlets instead of blocking
+from gevent import monkey
+monkey.patch_all()
+
+from psycogreen.gevent import patch_psycopg
+patch_psycopg()
+
+from app import app  # noqa: E402
@@ -0,0 +1,22 @@
+-- Precomputed risk zone features for GET /api/risk-zones
+--
+-- Risk zones change rarely, so their GeoJSON is generated once here instead
+-- of on every request. It is kept as text at 5 decimals (~1 m), matching the
+-- other GeoJSON built by backend/app.py, so the API can write it into the
+-- response as-is. Refreshed by POST /api/update-risk-zones:
+--   REFRESH MATERIALIZED VIEW CONCURRENTLY flood_risk_zones_mv;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS flood_risk_zones_mv AS
+SELECT
+    id, region_id, risk_level, risk_score,
+    factors, calculated_at,
+    ST_AsGeoJSON(geom, 5, 0) AS geom
+FROM flood_risk_zones;
+
+-- Required by REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS flood_risk_zones_mv_id ON flood_risk_zones_mv (id);
+
+-- Filters used by /api/risk-zones
+CREATE INDEX IF NOT EXISTS flood_risk_zones_mv_region ON flood_risk_zones_mv (region_id);
+CREATE INDEX IF NOT EXISTS flood_risk_zones_mv_level ON flood_risk_zones_mv (risk_level);
+CREATE INDEX IF NOT EXISTS flood_risk_zones_mv_score ON flood_risk_zones_mv (risk_score DESC);
@@ -0,0 +1,8 @@
+-- Lets /api/rainfall/stations aggregate each station's measurements with an
+-- index scan instead of scanning all of rainfall_data
+--
+-- Built CONCURRENTLY so rainfall inserts are not blocked while it builds;
+-- psql runs the statement in its own transaction, which CONCURRENTLY requires.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rainfall_data_station_time
+    ON rainfall_data (station_id, recorded_at DESC);
@@ -0,0 +1,23 @@
+-- Indexes for the filters and spatial lookups used by backend/app.py
+--
+-- Built CONCURRENTLY so live tables stay writable; psql runs each statement
+-- in its own transaction, which CONCURRENTLY requires.
+
+-- calculate_flood_risk() point-in-polygon lookups
+CREATE INDEX CONCURRENTLY IF NOT EXISTS regions_geom_gix
+    ON regions USING GIST (geom);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS risk_zones_geom_gix
+    ON flood_risk_zones USING GIST (geom);
+
+-- /api/rainfall time window and the 24 h statistics
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rainfall_data_recorded_at
+    ON rainfall_data (recorded_at DESC);
+
+-- critical_zones and high_risk_zones statistics (/api/risk-zones itself
+-- reads flood_risk_zones_mv, which has its own indexes)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS risk_zones_level
+    ON flood_risk_zones (risk_level);
+
+-- /api/alerts/active and the active_alerts statistic
+CREATE INDEX CONCURRENTLY IF NOT EXISTS alerts_active_exp
+    ON flood_alerts (active, expires_at) WHERE active = TRUE;
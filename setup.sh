@@ -22,10 +22,17 @@ echo "Setting up database schema..."
 psql -U postgres -d flood_alert -f database/schema.sql
 psql -U postgres -d flood_alert -f database/sample_data.sql
 
+# Apply migrations in order
+echo "Applying migrations..."
+for migration in database/migrations/*.sql; do
+    psql -U postgres -d flood_alert -f "$migration"
+done
+
 echo "=================================="
 echo "Setup complete!"
 echo "=================================="
 echo "Next steps:"
 echo "1. Update backend/config.py with your database credentials"
 echo "2. Run: cd backend && python app.py"
+echo "   (production: cd backend && gunicorn -c gunicorn.conf.py wsgi:app)"
 echo "3. Open frontend/index.html in your browser"
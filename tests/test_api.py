@@ -56,3 +56,56 @@ def test_invalid_risk_calculation(client):
                           data=json.dumps(payload),
                           content_type='application/json')
     assert response.status_code == 400
+
+def test_bulk_rainfall_requires_data(client):
+    """Test bulk rainfall upload with no data"""
+    response = client.post('/api/rainfall/add-bulk',
+                          data=json.dumps({}),
+                          content_type='application/json')
+    assert response.status_code == 400
+
+def test_bulk_rainfall_requires_measurements_list(client):
+    """Test bulk rainfall upload with an empty or non-list measurements field"""
+    for measurements in [[], {'station_id': 1, 'rainfall_mm': 5.0}, 'abc']:
+        payload = {'measurements': measurements}
+        response = client.post('/api/rainfall/add-bulk',
+                              data=json.dumps(payload),
+                              content_type='application/json')
+        assert response.status_code == 400
+
+def test_bulk_rainfall_invalid_measurement(client):
+    """Test bulk rainfall upload with a measurement missing rainfall_mm"""
+    payload = {
+        'measurements': [
+            {'station_id': 1, 'rainfall_mm': 12.5},
+            {'station_id': 2}
+        ]
+    }
+    response = client.post('/api/rainfall/add-bulk',
+                          data=json.dumps(payload),
+                          content_type='application/json')
+    assert response.status_code == 400
+
+def test_bulk_rainfall_too_many_measurements(client):
+    """Test bulk rainfall upload above the per-request limit"""
+    payload = {
+        'measurements': [{'station_id': 1, 'rainfall_mm': 1.0}] * 10001
+    }
+    response = client.post('/api/rainfall/add-bulk',
+                          data=json.dumps(payload),
+                          content_type='application/json')
+    assert response.status_code == 400
+
+def test_tile_unknown_layer(client):
+    """Test vector tile request for a layer that does not exist"""
+    response = client.get('/api/tiles/roads/0/0/0.mvt')
+    assert response.status_code == 404
+
+def test_tile_out_of_range(client):
+    """Test vector tile requests outside the tile grid or zoom range"""
+    for path in ['/api/tiles/regions/0/1/0.mvt',
+                 '/api/tiles/regions/0/0/1.mvt',
+                 '/api/tiles/water_bodies/2/4/0.mvt',
+                 '/api/tiles/regions/19/0/0.mvt']:
+        response = client.get(path)
+        assert response.status_code == 404